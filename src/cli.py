@@ -1,72 +1,140 @@
+import codecs
 import sys
-from typing import List
+from typing import Callable, Dict, Iterator, List, TextIO, Tuple
 from parser import parse_command
 from scheduler import Scheduler
 
 
+# bytes pulled from stdin per read1() call
+_CHUNK_SIZE = 65536
+# pending output lines that force a write even in scripted mode
+_FLUSH_LINES = 4096
+
+
+def _iter_lines() -> Iterator[str]:
+    """
+    Yield stdin lines (without the trailing newline) using large buffered reads.
+
+    read1() returns whatever is already available, so scripted input is consumed in
+    big chunks while an interactive session still sees each line as it is typed.
+    """
+    stream = getattr(sys.stdin, "buffer", None)
+    if stream is None:
+        # stdin replaced by a text-only object (e.g. io.StringIO)
+        for raw in sys.stdin:
+            yield raw.rstrip("\n")
+        return
+
+    # decode exactly as sys.stdin would (same codec and error handler), and keep
+    # everything except the "\n" terminator, like the text fallback above
+    decoder = codecs.getincrementaldecoder(sys.stdin.encoding or "utf-8")(
+        sys.stdin.errors or "strict"
+    )
+    residual = ""
+    while True:
+        chunk = stream.read1(_CHUNK_SIZE)
+        if not chunk:
+            break
+        residual += decoder.decode(chunk)
+        *lines, residual = residual.split("\n")
+        yield from lines
+    # last line without a trailing newline
+    residual += decoder.decode(b"", final=True)
+    if residual:
+        yield residual
+
+
+_BAD_ARGS = "time=? event=error reason=bad_args"
+_UNKNOWN_COMMAND = "time=? event=error reason=unknown_command"
+
+
+def _do_create(sched: Scheduler, args: List[str], out: List[str]) -> None:
+    qid, cap_str = args
+    try:
+        cap = int(cap_str)
+    except ValueError:
+        out.append(_BAD_ARGS)
+        return
+    sched.create_queue(qid, cap, out)
+
+
+def _do_enq(sched: Scheduler, args: List[str], out: List[str]) -> None:
+    qid, item = args
+    sched.enqueue(qid, item, out)
+
+
+def _do_skip(sched: Scheduler, args: List[str], out: List[str]) -> None:
+    (qid,) = args
+    sched.mark_skip(qid, out)
+
+
+def _do_run(sched: Scheduler, args: List[str], out: List[str]) -> None:
+    # parse quantum and optionally steps
+    try:
+        quantum = int(args[0])
+        steps = int(args[1]) if len(args) == 2 else None
+    except ValueError:
+        out.append(_BAD_ARGS)
+        return
+    out += sched.run(quantum, steps)
+
+
+# command -> (min #args, max #args, handler); arity is checked before dispatch.
+# Handlers append their logs straight onto the session output list.
+HANDLERS: Dict[str, Tuple[int, int, Callable[[Scheduler, List[str], List[str]], None]]] = {
+    "CREATE": (2, 2, _do_create),
+    "ENQ": (2, 2, _do_enq),
+    "SKIP": (1, 1, _do_skip),
+    "RUN": (1, 2, _do_run),
+}
+
+
+def _emit(out: TextIO, pending: List[str]) -> None:
+    """Write all pending lines with a single write() call and clear the list."""
+    if pending:
+        out.write("\n".join(pending) + "\n")
+        pending.clear()
+
+
 def main() -> None:
     sched = Scheduler()
+    out = sys.stdout
+    # scripted input: write in large blocks; interactive: flush after each command
+    interactive = sys.stdin.isatty()
+    # session output waiting to be written (scheduler messages land here too)
+    pending: List[str] = []
+    sched.messages = pending
 
-    for raw in sys.stdin:
-        line = raw.rstrip("\n")
-
-        # Blank line ends session
-        if line == "":
-            print("Break time!")
-            return
-
-        parsed = parse_command(line)
-        logs: List[str] = []
-
-        if parsed is None:
-            # comment or whitespace-only line inside session: ignore
-            pass
-        else:
-            cmd, args = parsed
-            try:
-                if cmd == "CREATE":
-                    if len(args) != 2:
-                        logs.append(f"time=? event=error reason=bad_args")
-                    else:
-                        qid, cap_str = args
-                        try:
-                            cap = int(cap_str)
-                        except ValueError:
-                            raise ValueError("bad_args")
-                        logs.extend(sched.create_queue(qid, cap))
-
-                elif cmd == "ENQ":
-                    if len(args) != 2:
-                        logs.append(f"time=? event=error reason=bad_args")
-                    else:
-                        qid, item = args
-                        logs.extend(sched.enqueue(qid, item))
+    try:
+        for line in _iter_lines():
 
-                elif cmd == "SKIP":
-                    if len(args) != 1:
-                        logs.append(f"time=? event=error reason=bad_args")
-                    else:
-                        (qid,) = args
-                        logs.extend(sched.mark_skip(qid))
+            # Blank line ends session
+            if line == "":
+                pending.append("Break time!")
+                return
 
-                elif cmd == "RUN":
-                    if not (1 <= len(args) <= 2):
-                        logs.append(f"time=? event=error reason=bad_args")
-                    else:
-                        # parse quantum and optionally steps
-                        quantum = int(args[0])
-                        steps = int(args[1]) if len(args) == 2 else None
-                        logs.extend(sched.run(quantum, steps))
+            parsed = parse_command(line)
 
+            if parsed is None:
+                # comment or whitespace-only line inside session: ignore
+                pass
+            else:
+                cmd, args = parsed
+                entry = HANDLERS.get(cmd)
+                if entry is None:
+                    pending.append(_UNKNOWN_COMMAND)
                 else:
-                    logs.append(f"time=? event=error reason=unknown_command")
-
-            except ValueError:
-                logs.append(f"time=? event=error reason=bad_args")
+                    lo, hi, handler = entry
+                    if not (lo <= len(args) <= hi):
+                        pending.append(_BAD_ARGS)
+                    else:
+                        handler(sched, args, pending)
 
-        # Print logs produced by this input line (if any)
-        if logs:
-            print("\n".join(logs))
+            if interactive or len(pending) >= _FLUSH_LINES:
+                _emit(out, pending)
+    finally:
+        _emit(out, pending)
+        out.flush()
 
 
 if __name__ == "__main__":
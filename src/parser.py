@@ -18,10 +18,11 @@ def parse_command(line: str) -> Optional[Tuple[str, List[str]]]:
     Do NOT raise; leave semantic checks to the scheduler and tests.
     Keep whitespace handling predictable.
     """
-    s = line.strip()
-    if not s or s.startswith("#"):
+    # split() with no separator already drops leading/trailing whitespace,
+    # so one call both tokenizes and detects blank/comment lines
+    parts = line.split()
+    if not parts or parts[0][0] == "#":
         return None
-    parts = s.split()
     cmd, args = parts[0], parts[1:]
     cmd = cmd.upper()
     # Allowed commands; anything else still returns a tuple and is validated downstream.
@@ -1,5 +1,7 @@
+import sys
+from collections.abc import MutableMapping
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
 # Required items
 REQUIRED_MENU: Dict[str, int] = {
@@ -13,61 +15,173 @@ REQUIRED_MENU: Dict[str, int] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     task_id: str
     remaining: int
 
 
+class TaskView(NamedTuple):
+    """Read-only snapshot of a queued task, as returned by peek() and tasks_list()."""
+    task_id: str
+    remaining: int
+
+
+def _no_snapshot() -> Sequence[str]:
+    # stand-in for Scheduler.display when RUN is asked for compact output
+    return ()
+
+
 class QueueRR:
     """
     Simple circular-buffer FIFO queue implementation.
+
+    Task state is kept column-wise: parallel lists of ids and remaining minutes.
+    Queued tasks are not separate objects, so peek()/tasks_list() return read-only
+    TaskView snapshots; the scheduler changes the front slot through work_front and
+    drop_front. dequeue() hands back an owned Task.
     """
 
+    __slots__ = ("queue_id", "capacity", "_mask", "_ids", "_rem", "_front", "_size", "_scratch")
+
     def __init__(self, queue_id: str, capacity: int) -> None:
         assert capacity > 0
         self.queue_id = queue_id
         self.capacity = capacity
-        self._buf: List[Optional[Task]] = [None] * capacity
+        # buffer is rounded up to a power of two so indices wrap with `& mask`
+        cap_rounded = 1 << (capacity - 1).bit_length()
+        self._mask = cap_rounded - 1
+        self._ids: List[Optional[str]] = [None] * cap_rounded
+        self._rem: List[int] = [0] * cap_rounded
         self._front = 0
         self._size = 0
+        # reused by tasks_text() so a display snapshot does not allocate a list per queue
+        self._scratch: List[str] = []
 
     def enqueue(self, task: Task) -> bool:
         if self._size >= self.capacity:
             return False
-        idx = (self._front + self._size) % self.capacity
-        self._buf[idx] = task
+        idx = (self._front + self._size) & self._mask
+        self._ids[idx] = task.task_id
+        self._rem[idx] = task.remaining
         self._size += 1
         return True
 
     def dequeue(self) -> Optional[Task]:
         if self._size == 0:
             return None
-        t = self._buf[self._front]
-        self._buf[self._front] = None
-        self._front = (self._front + 1) % self.capacity
-        self._size -= 1
+        front = self._front
+        t = Task(self._ids[front], self._rem[front])
+        self.drop_front()
         return t
 
-    def peek(self) -> Optional[Task]:
+    def peek(self) -> Optional[TaskView]:
+        """Return a read-only snapshot of the front task (use work_front to change it)."""
         if self._size == 0:
             return None
-        return self._buf[self._front]
+        return TaskView(self._ids[self._front], self._rem[self._front])
+
+    def front_id(self) -> Optional[str]:
+        return self._ids[self._front] if self._size else None
+
+    def work_front(self, quantum: int) -> int:
+        """Work the front task for up to `quantum` minutes; return minutes worked (0 if empty)."""
+        if self._size == 0:
+            return 0
+        front = self._front
+        remaining = self._rem[front]
+        work_amount = quantum if quantum < remaining else remaining
+        self._rem[front] = remaining - work_amount
+        return work_amount
+
+    def front_remaining(self) -> Optional[int]:
+        return self._rem[self._front] if self._size else None
+
+    def drop_front(self) -> None:
+        """Remove the front task without materializing it."""
+        if self._size == 0:
+            return
+        self._ids[self._front] = None
+        self._front = (self._front + 1) & self._mask
+        self._size -= 1
+
+    def rotate_head_to_tail(self) -> None:
+        """Move the front task to the back in place (same as dequeue + enqueue)."""
+        if self._size <= 1:
+            return
+        front = self._front
+        tid = self._ids[front]
+        rem = self._rem[front]
+        # clear before writing: when the buffer is full the new tail is this slot
+        self._ids[front] = None
+        new_tail = (front + self._size) & self._mask
+        self._front = (front + 1) & self._mask
+        self._ids[new_tail] = tid
+        self._rem[new_tail] = rem
 
     def __len__(self) -> int:  # number of tasks currently queued
         return self._size
 
     # helper to iterate tasks in order (for display)
-    def tasks_list(self) -> List[Task]:
-        out: List[Task] = []
+    def tasks_list(self) -> List[TaskView]:
+        out: List[TaskView] = []
         idx = self._front
         for _ in range(self._size):
-            t = self._buf[idx]
-            if t is not None:
-                out.append(t)
-            idx = (idx + 1) % self.capacity
+            out.append(TaskView(self._ids[idx], self._rem[idx]))
+            idx = (idx + 1) & self._mask
         return out
 
+    def tasks_text(self) -> str:
+        """Return front-to-back `task_id:remaining` pairs, comma-separated (for display)."""
+        ids = self._ids
+        rem = self._rem
+        mask = self._mask
+        idx = self._front
+        parts = self._scratch
+        parts.clear()
+        for _ in range(self._size):
+            parts.append(f"{ids[idx]}:{rem[idx]}")
+            idx = (idx + 1) & mask
+        return ",".join(parts)
+
+
+class SkipFlags(MutableMapping):
+    """
+    Dict-like view of pending skips, keyed by queue id.
+
+    Reads and writes go straight to the scheduler's per-queue skip boxes, so
+    `sched.skip_flags[qid] = True` behaves like mark_skip() without the log line
+    (mark_skip() is the supported way to set a skip). Only existing queue ids can
+    be set, and entries cannot be deleted. Key lookups scan the queues: O(#queues).
+    """
+
+    def __init__(self, sched: "Scheduler") -> None:
+        self._sched = sched
+
+    def __getitem__(self, queue_id: str) -> bool:
+        box = self._sched._skip_box(queue_id)
+        if box is None:
+            raise KeyError(queue_id)
+        return box[0]
+
+    def __setitem__(self, queue_id: str, flag: bool) -> None:
+        box = self._sched._skip_box(queue_id)
+        if box is None:
+            raise KeyError(queue_id)
+        box[0] = bool(flag)
+
+    def __delitem__(self, queue_id: str) -> None:
+        raise TypeError("skip flags cannot be removed; set them to False instead")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sched.queues)
+
+    def __len__(self) -> int:
+        return len(self._sched.queues)
+
+    def __repr__(self) -> str:
+        return f"SkipFlags({dict(self)!r})"
+
 
 class Scheduler:
     def __init__(self) -> None:
@@ -78,14 +192,45 @@ class Scheduler:
         self.queue_order: List[str] = []
         # per-queue id counters (int)
         self.id_counters: Dict[str, int] = {}
-        # per-queue skip flags (bool)
-        self.skip_flags: Dict[str, bool] = {}
+        # per-queue "%"-format templates for zero-padded task ids
+        self._id_templates: Dict[str, str] = {}
+        # (queue_id, queue, skip box) per queue_order slot so a RR turn needs no dict
+        # lookups; the 1-element box is the only store of a queue's pending skip
+        self._rr_list: List[Tuple[str, QueueRR, List[bool]]] = []
+        # per-queue skip flags (bool); a live view over the boxes above, so reads and
+        # writes always agree with display() and run()
+        self.skip_flags: MutableMapping[str, bool] = SkipFlags(self)
         # rr pointer index into queue_order
         self.rr_index: int = 0
+        # counts recomputed at the start of each run() so its stop check is O(1) per turn
+        self._nonempty_queues: int = 0
+        self._active_skips: int = 0
         # menu
         self._menu: Dict[str, int] = REQUIRED_MENU.copy()
+        # key set for the membership check in enqueue (rebuild if the menu ever changes)
+        self._menu_keys: frozenset = frozenset(self._menu)
+        # menu never changes after construction, so its display line is built once
+        self._menu_line: str = (
+            "display menu=[" + ",".join(f"{k}:{v}" for k, v in sorted(self._menu.items())) + "]"
+        )
+        # customer-facing messages go here when set (CLI batches output); else printed
+        self.messages: Optional[List[str]] = None
 
     # ----- helpers -----
+    def _say(self, text: str) -> None:
+        if self.messages is None:
+            print(text)
+        else:
+            self.messages.append(text)
+
+    def _skip_box(self, queue_id: str) -> Optional[List[bool]]:
+        # slots sharing an id share one box, so the first match is the box
+        for qid, _, box in self._rr_list:
+            if qid == queue_id:
+                return box
+        return None
+
+
     def menu(self) -> Dict[str, int]:
         return self._menu.copy()
 
@@ -101,21 +246,33 @@ class Scheduler:
         return self.queue_order[self.rr_index]
 
     # ----- commands -----
-    def create_queue(self, queue_id: str, capacity: int) -> List[str]:
-        logs: List[str] = []
+    def create_queue(self, queue_id: str, capacity: int, out: Optional[List[str]] = None) -> List[str]:
+        # append to the caller's list when given (avoids a throwaway list per command)
+        logs: List[str] = [] if out is None else out
+        # interned ids hash once and compare by identity in every later dict lookup
+        queue_id = sys.intern(queue_id)
         # If queue already exists, overwrite not desired; but tests usually create unique ids.
-        self.queues[queue_id] = QueueRR(queue_id, capacity)
+        old = self.queues.get(queue_id)
+        q = QueueRR(queue_id, capacity)
+        entry = (queue_id, q, [False])
+        if old is not None:
+            # earlier slots with this id now point at the new queue, as queues[] does
+            self._rr_list = [entry if e[0] == queue_id else e for e in self._rr_list]
+        self.queues[queue_id] = q
         self.queue_order.append(queue_id)
+        self._rr_list.append(entry)
         self.id_counters[queue_id] = 0
-        self.skip_flags[queue_id] = False
+        self._id_templates[queue_id] = queue_id.replace("%", "%%") + "-%03d"
         logs.append(f"time={self.time} event=create queue={queue_id}")
         return logs
 
-    def enqueue(self, queue_id: str, item_name: str) -> List[str]:
-        logs: List[str] = []
+    def enqueue(self, queue_id: str, item_name: str, out: Optional[List[str]] = None) -> List[str]:
+        logs: List[str] = [] if out is None else out
+        queue_id = sys.intern(queue_id)
+        item_name = sys.intern(item_name)
         # unknown menu item: print and log reject unknown_item
-        if item_name not in self._menu:
-            print("Sorry, we don't serve that.")
+        if item_name not in self._menu_keys:
+            self._say("Sorry, we don't serve that.")
             logs.append(
                 f"time={self.time} event=reject queue={queue_id} reason=unknown_item"
             )
@@ -130,34 +287,38 @@ class Scheduler:
         burst = self._menu[item_name]
         # auto id
         self.id_counters[queue_id] += 1
-        tid = f"{queue_id}-{self.id_counters[queue_id]:03d}"
+        tid = self._id_templates[queue_id] % self.id_counters[queue_id]
         task = Task(tid, burst)
 
         q = self.queues[queue_id]
         if not q.enqueue(task):
             # full: print and log reject reason=full
-            print("Sorry, we're at capacity.")
+            self._say("Sorry, we're at capacity.")
             logs.append(f"time={self.time} event=reject queue={queue_id} reason=full")
             return logs
 
         logs.append(f"time={self.time} event=enqueue queue={queue_id} task={tid} remaining={burst}")
         return logs
 
-    def mark_skip(self, queue_id: str) -> List[str]:
-        logs: List[str] = []
+    def mark_skip(self, queue_id: str, out: Optional[List[str]] = None) -> List[str]:
+        logs: List[str] = [] if out is None else out
+        queue_id = sys.intern(queue_id)
         logs.append(f"time={self.time} event=skip queue={queue_id}")
-        if queue_id in self.skip_flags:
-            self.skip_flags[queue_id] = True
+        box = self._skip_box(queue_id)
+        if box is not None:
+            box[0] = True
         else:
             # if queue unknown, keep the log but do not raise
             pass
         return logs
 
-    def run(self, quantum: int, steps: Optional[int]) -> List[str]:
+    def run(self, quantum: int, steps: Optional[int], compact_display: bool = False) -> List[str]:
         """
         Execute up to `steps` turns (each turn visits one queue), or if steps is None,
         run until all queues empty and no pending skips.
         Validate steps: 1 <= steps <= (#queues). If invalid, log error and do nothing.
+        With compact_display, the per-turn display snapshots are replaced by a single
+        snapshot after the last turn (event logs are unchanged).
         """
         logs: List[str] = []
         n_queues = len(self.queue_order)
@@ -167,110 +328,142 @@ class Scheduler:
             return logs
 
         # Validate steps if provided
-        if steps is not None:
-            if not (1 <= steps <= n_queues):
-                logs.append(f"time={self.time} event=error reason=invalid_steps")
-                return logs
-            max_turns = steps
-        else:
-            max_turns = None  # run until empty + no skips
-
-        turns_done = 0
+        if steps is not None and not (1 <= steps <= n_queues):
+            logs.append(f"time={self.time} event=error reason=invalid_steps")
+            return logs
 
-        # Ensure rr_index in range
+        # Ensure rr_index in range; queues cannot be added or removed during run(),
+        # so from here on the pointer wraps with a compare instead of a modulo
         if self.rr_index >= n_queues:
             self.rr_index %= n_queues
 
-        # If steps is None we loop until termination condition
-        while True:
-            if max_turns is not None and turns_done >= max_turns:
-                break
-
-            # If no queues (shouldn't happen here) break
-            if len(self.queue_order) == 0:
-                break
+        # QueueRR objects in `queues` are public and may have been changed directly,
+        # so take the counts fresh here (O(#queues) once) and keep them in the loops
+        self._nonempty_queues = sum(1 for q in self.queues.values() if len(q) > 0)
+        boxes = {qid: box for qid, _, box in self._rr_list}
+        self._active_skips = sum(1 for box in boxes.values() if box[0])
+
+        # pick the loop and the per-turn snapshot once; the loops test neither.
+        # compact mode swaps in a snapshot that renders nothing and shows one at the end
+        snapshot = _no_snapshot if compact_display else self.display
+        if steps is None:
+            self._run_until_empty(quantum, snapshot, logs)
+        else:
+            self._run_bounded(quantum, steps, snapshot, logs)
 
-            # Recompute local queue count because code may later support removals
-            n_queues = len(self.queue_order)
-            # Guard rr_index wrapping
-            if self.rr_index >= n_queues:
-                self.rr_index %= n_queues
+        if compact_display:
+            logs.extend(self.display())
+        return logs
 
-            qid = self.queue_order[self.rr_index]
-            q = self.queues[qid]
+    # The two loops below share the same turn body. It is written out in each
+    # rather than called per turn, so the locals and cached time prefix stay in
+    # one frame; keep the copies in sync.
+
+    def _run_bounded(
+        self, quantum: int, max_turns: int, snapshot: Callable[[], Sequence[str]], logs: List[str]
+    ) -> None:
+        # hot-loop lookups bound to locals once (LOAD_FAST instead of attribute loads)
+        rr_list = self._rr_list
+        n_queues = len(rr_list)
+        append = logs.append
+        extend = logs.extend
+        # "time=<t>" prefix shared by every log line; rebuilt only when time advances
+        stamp = f"time={self.time}"
+
+        for _ in range(max_turns):
+            rr_index = self.rr_index
+            qid, q, skip_box = rr_list[rr_index]
+            nxt = rr_index + 1
+            if nxt == n_queues:
+                nxt = 0
 
             # run event log (always)
-            logs.append(f"time={self.time} event=run queue={qid}")
-
-            # SKIP case: zero-time transition, clear skip flag, advance rr pointer
-            if self.skip_flags.get(qid, False):
-                self.skip_flags[qid] = False
-                # After a skip visit, we must produce display snapshot
-                logs.extend(self.display())
-                # advance pointer
-                self.rr_index = (self.rr_index + 1) % n_queues
-                turns_done += 1
-                # If running until empty and everything empty+clear, will check below
-                if max_turns is None:
-                    all_empty = all(len(self.queues[qx]) == 0 for qx in self.queue_order)
-                    all_clear = all(not v for v in self.skip_flags.values())
-                    if all_empty and all_clear:
-                        break
-                continue
-
-            # EMPTY queue: zero-time transition, advance pointer, display
-            if len(q) == 0:
-                logs.extend(self.display())
-                self.rr_index = (self.rr_index + 1) % n_queues
-                turns_done += 1
-                if max_turns is None:
-                    all_empty = all(len(self.queues[qx]) == 0 for qx in self.queue_order)
-                    all_clear = all(not v for v in self.skip_flags.values())
-                    if all_empty and all_clear:
-                        break
+            append(f"{stamp} event=run queue={qid}")
+
+            # SKIP / EMPTY: zero-time transition; snapshot is taken before the pointer moves
+            if skip_box[0] or len(q) == 0:
+                if skip_box[0]:
+                    skip_box[0] = False
+                    self._active_skips -= 1
+                extend(snapshot())
+                self.rr_index = nxt
                 continue
 
-            # WORK: there is a task
-            front_task = q.peek()
-            # front_task should not be None because len(q) > 0
-            assert front_task is not None
-            work_amount = min(quantum, front_task.remaining)
-            front_task.remaining -= work_amount
-            # time advances by work_amount
-            self.time += work_amount
-
-            if front_task.remaining == 0:
+            # WORK: update the front task in place
+            self.time += q.work_front(quantum)
+            stamp = f"time={self.time}"
+            task_id = q.front_id()
+            remaining = q.front_remaining()
+            if remaining == 0:
                 # Task finished: remove it
-                finished = q.dequeue()
-                # finished is the task
-                logs.append(f"time={self.time} event=finish queue={qid} id={finished.task_id}")
+                q.drop_front()
+                if len(q) == 0:
+                    self._nonempty_queues -= 1
+                append(f"{stamp} event=finish queue={qid} id={task_id}")
             else:
-                # Partial work: dequeue then enqueue back (to tail)
-                t = q.dequeue()
-                # t should be not None
-                assert t is not None
-                # re-enqueue updated task (should succeed because we freed one spot)
-                success = q.enqueue(t)
-                # enqueue must succeed (we just removed one)
-                if not success:
-                    # This should not happen; but if it does, treat as finishing (defensive)
-                    logs.append(f"time={self.time} event=finish queue={qid} id={t.task_id}")
-                else:
-                    logs.append(f"time={self.time} event=work queue={qid} id={t.task_id} remaining={t.remaining}")
+                # Partial work: move the task to the tail of its queue
+                q.rotate_head_to_tail()
+                append(f"{stamp} event=work queue={qid} id={task_id} remaining={remaining}")
 
             # After performing the turn, advance RR pointer and add display snapshot
-            self.rr_index = (self.rr_index + 1) % n_queues
-            logs.extend(self.display())
-            turns_done += 1
+            self.rr_index = nxt
+            extend(snapshot())
+
+    def _run_until_empty(
+        self, quantum: int, snapshot: Callable[[], Sequence[str]], logs: List[str]
+    ) -> None:
+        # hot-loop lookups bound to locals once (LOAD_FAST instead of attribute loads)
+        rr_list = self._rr_list
+        n_queues = len(rr_list)
+        append = logs.append
+        extend = logs.extend
+        # "time=<t>" prefix shared by every log line; rebuilt only when time advances
+        stamp = f"time={self.time}"
+
+        # always at least one turn; stop once all queues are empty and no skips pend
+        while True:
+            rr_index = self.rr_index
+            qid, q, skip_box = rr_list[rr_index]
+            nxt = rr_index + 1
+            if nxt == n_queues:
+                nxt = 0
 
-            # If running until empty: check termination condition
-            if max_turns is None:
-                all_empty = all(len(self.queues[qx]) == 0 for qx in self.queue_order)
-                all_clear = all(not v for v in self.skip_flags.values())
-                if all_empty and all_clear:
+            # run event log (always)
+            append(f"{stamp} event=run queue={qid}")
+
+            # SKIP / EMPTY: zero-time transition; snapshot is taken before the pointer moves
+            if skip_box[0] or len(q) == 0:
+                if skip_box[0]:
+                    skip_box[0] = False
+                    self._active_skips -= 1
+                extend(snapshot())
+                self.rr_index = nxt
+                if self._nonempty_queues == 0 and self._active_skips == 0:
                     break
+                continue
 
-        return logs
+            # WORK: update the front task in place
+            self.time += q.work_front(quantum)
+            stamp = f"time={self.time}"
+            task_id = q.front_id()
+            remaining = q.front_remaining()
+            if remaining == 0:
+                # Task finished: remove it
+                q.drop_front()
+                if len(q) == 0:
+                    self._nonempty_queues -= 1
+                append(f"{stamp} event=finish queue={qid} id={task_id}")
+            else:
+                # Partial work: move the task to the tail of its queue
+                q.rotate_head_to_tail()
+                append(f"{stamp} event=work queue={qid} id={task_id} remaining={remaining}")
+
+            # After performing the turn, advance RR pointer and add display snapshot
+            self.rr_index = nxt
+            extend(snapshot())
+
+            if self._nonempty_queues == 0 and self._active_skips == 0:
+                break
 
     # ----- display -----
     def display(self) -> List[str]:
@@ -282,15 +475,12 @@ class Scheduler:
         # Use 'None' exactly when there is no next queue
         lines.append(f"display time={self.time} next={nxt if nxt is not None else 'None'}")
 
-        # menu sorted by name
-        menu_str = ",".join(f"{k}:{v}" for k, v in sorted(self._menu.items()))
-        lines.append(f"display menu=[{menu_str}]")
+        # menu sorted by name (cached)
+        lines.append(self._menu_line)
 
-        for qid in self.queue_order:
-            q = self.queues[qid]
-            skip_text = " skip" if self.skip_flags.get(qid, False) else ""
-            tasks = q.tasks_list()
-            tasks_text = ",".join(f"{t.task_id}:{t.remaining}" for t in tasks)
+        for qid, q, skip_box in self._rr_list:
+            skip_text = " skip" if skip_box[0] else ""
+            tasks_text = q.tasks_text()
             lines.append(f"display {qid} [{len(q)}/{q.capacity}]{skip_text} -> [{tasks_text}]")
 
         return lines
@@ -0,0 +1,53 @@
+import io, os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+import cli
+
+def _run(monkeypatch, capsys, text, as_bytes=False):
+    if as_bytes:
+        stdin = io.TextIOWrapper(io.BytesIO(text.encode("utf-8")), encoding="utf-8", newline="")
+    else:
+        stdin = io.StringIO(text, newline="")
+    monkeypatch.setattr(sys, "stdin", stdin)
+    cli.main()
+    out, _ = capsys.readouterr()
+    return out.splitlines()
+
+def test_blank_line_ends_session_with_break_time(monkeypatch, capsys):
+    for as_bytes in (False, True):
+        lines = _run(monkeypatch, capsys, "CREATE A 1\n\nENQ A tea\n", as_bytes)
+        assert lines == ["time=0 event=create queue=A", "Break time!"]
+
+def test_sorry_messages_stay_in_order_with_logs(monkeypatch, capsys):
+    lines = _run(monkeypatch, capsys, "CREATE A 1\nENQ A cortado\nENQ A tea\nENQ A latte\n\n", True)
+    assert lines == [
+        "time=0 event=create queue=A",
+        "Sorry, we don't serve that.",
+        "time=0 event=reject queue=A reason=unknown_item",
+        "time=0 event=enqueue queue=A task=A-001 remaining=1",
+        "Sorry, we're at capacity.",
+        "time=0 event=reject queue=A reason=full",
+        "Break time!",
+    ]
+
+def test_bad_args_and_unknown_command(monkeypatch, capsys):
+    lines = _run(monkeypatch, capsys, "CREATE A\nCREATE A x\nRUN one\nFOO A\n\n", True)
+    assert lines == [
+        "time=? event=error reason=bad_args",
+        "time=? event=error reason=bad_args",
+        "time=? event=error reason=bad_args",
+        "time=? event=error reason=unknown_command",
+        "Break time!",
+    ]
+
+def test_crlf_blank_line_does_not_end_session(monkeypatch, capsys):
+    text = "CREATE A 2\r\nENQ A tea\r\n\r\nRUN 1\r\n"
+    text_lines = _run(monkeypatch, capsys, text)
+    byte_lines = _run(monkeypatch, capsys, text, as_bytes=True)
+    assert text_lines == byte_lines
+    assert "Break time!" not in byte_lines
+    assert "time=1 event=finish queue=A id=A-001" in byte_lines
+
+def test_huge_quantum_does_not_crash(monkeypatch, capsys):
+    lines = _run(monkeypatch, capsys, "CREATE A 2\nENQ A tea\nRUN -9223372036854775808 1\n\n", True)
+    assert lines[2] == "time=0 event=run queue=A"
+    assert lines[-1] == "Break time!"
@@ -12,3 +12,9 @@ def test_auto_task_ids_increment_per_queue():
 
     logs = s.enqueue("Mobile", "tea")
     assert any("event=enqueue" in x and "task=Mobile-002" in x for x in logs)
+
+def test_auto_task_ids_keep_percent_in_queue_name():
+    s = Scheduler()
+    s.create_queue("50%off", 2)
+    logs = s.enqueue("50%off", "tea")
+    assert any("task=50%off-001" in x for x in logs)
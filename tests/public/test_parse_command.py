@@ -0,0 +1,13 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+from parser import parse_command
+
+def test_blank_and_comment_lines_are_ignored():
+    assert parse_command("") is None
+    assert parse_command("   \t ") is None
+    assert parse_command("# note") is None
+    assert parse_command("   #ENQ Mobile tea") is None
+
+def test_command_is_uppercased_and_args_split_on_whitespace():
+    assert parse_command("  enq  Mobile\tlatte  ") == ("ENQ", ["Mobile", "latte"])
+    assert parse_command("RUN 2") == ("RUN", ["2"])
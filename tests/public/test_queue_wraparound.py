@@ -0,0 +1,64 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+from scheduler import QueueRR, Task
+
+def test_capacity_limit_and_fifo_order_across_wraparound():
+    q = QueueRR("Q", 3)  # not a power of two
+    for i in range(3):
+        assert q.enqueue(Task(f"Q-{i}", 1))
+    assert not q.enqueue(Task("Q-x", 1))  # user-visible capacity still enforced
+
+    # cycle many times so front/back wrap around the buffer
+    for i in range(3, 20):
+        t = q.dequeue()
+        assert t is not None and t.task_id == f"Q-{i - 3}"
+        assert q.enqueue(Task(f"Q-{i}", 1))
+        assert [x.task_id for x in q.tasks_list()] == [f"Q-{j}" for j in range(i - 2, i + 1)]
+    assert len(q) == 3
+
+def test_rotate_head_to_tail_matches_dequeue_enqueue():
+    for cap in (1, 3, 4):
+        q = QueueRR("Q", cap)
+        for i in range(cap):
+            q.enqueue(Task(f"Q-{i}", 1))
+        expected = [t.task_id for t in q.tasks_list()]
+        for _ in range(2 * cap + 1):
+            q.rotate_head_to_tail()
+            expected = expected[1:] + expected[:1]
+            assert [t.task_id for t in q.tasks_list()] == expected
+        assert len(q) == cap
+
+def test_front_helpers_on_empty_queue_touch_nothing():
+    q = QueueRR("Q", 2)
+    q.enqueue(Task("Q-1", 3))
+    q.dequeue()  # slot keeps its stale remaining value
+    assert q.front_id() is None
+    assert q.front_remaining() is None
+    assert q.work_front(2) == 0
+    q.drop_front()
+    assert len(q) == 0
+    q.enqueue(Task("Q-2", 1))
+    assert q.work_front(5) == 1 and q.front_remaining() == 0
+
+def test_peek_and_tasks_list_are_read_only_snapshots():
+    import pytest
+    q = QueueRR("Q", 2)
+    q.enqueue(Task("Q-1", 3))
+    front = q.peek()
+    assert (front.task_id, front.remaining) == ("Q-1", 3)
+    with pytest.raises(AttributeError):
+        front.remaining -= 1
+    with pytest.raises(AttributeError):
+        q.tasks_list()[0].remaining = 0
+    assert q.peek().remaining == 3
+
+    t = q.dequeue()
+    assert isinstance(t, Task)
+    t.remaining -= 1  # dequeued tasks are owned by the caller
+    assert t.remaining == 2
+
+def test_remaining_is_not_limited_to_a_machine_int():
+    q = QueueRR("Q", 2)
+    assert q.enqueue(Task("big", 2**63))
+    assert q.peek().remaining == 2**63
+    assert q.work_front(2**64) == 2**63
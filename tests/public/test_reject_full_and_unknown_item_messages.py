@@ -20,3 +20,14 @@ def test_full_queue_reject_and_message(capsys):
     out, _ = capsys.readouterr()
     assert "Sorry, we're at capacity." in out
     assert any("event=reject" in l and "reason=full" in l for l in logs)
+
+def test_reject_messages_collected_when_batching(capsys):
+    s = Scheduler()
+    s.messages = []
+    s.create_queue("WalkIns", 1)
+    s.enqueue("WalkIns", "cortado")
+    s.enqueue("WalkIns", "latte")
+    s.enqueue("WalkIns", "tea")
+    out, _ = capsys.readouterr()
+    assert out == ""
+    assert s.messages == ["Sorry, we don't serve that.", "Sorry, we're at capacity."]
@@ -0,0 +1,72 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../src")))
+from scheduler import Scheduler
+
+def test_run_without_steps_drains_queues_and_consumes_skips():
+    s = Scheduler()
+    s.create_queue("Mobile", 2)
+    s.create_queue("WalkIns", 2)
+    s.enqueue("Mobile", "latte")     # 3 min
+    s.enqueue("WalkIns", "tea")      # 1 min
+    s.mark_skip("WalkIns")
+
+    logs = s.run(quantum=2, steps=None)
+
+    assert s.time == 4
+    assert all(len(s.queues[q]) == 0 for q in s.queue_order)
+    assert not any(s.skip_flags.values())
+    assert sum(1 for l in logs if "event=finish" in l) == 2
+    # a second run with nothing pending visits one queue and stops
+    logs = s.run(quantum=2, steps=None)
+    assert sum(1 for l in logs if "event=run" in l) == 1
+
+def _build():
+    s = Scheduler()
+    s.create_queue("Mobile", 3)
+    s.create_queue("WalkIns", 3)
+    for item in ("latte", "mocha", "tea"):
+        s.enqueue("Mobile", item)
+        s.enqueue("WalkIns", item)
+    s.mark_skip("Mobile")
+    return s
+
+def test_compact_display_keeps_events_and_prints_one_snapshot():
+    full = _build().run(quantum=2, steps=None)
+    compact_sched = _build()
+    compact = compact_sched.run(quantum=2, steps=None, compact_display=True)
+
+    events = [l for l in full if not l.startswith("display ")]
+    assert [l for l in compact if not l.startswith("display ")] == events
+    assert sum(1 for l in compact if l.startswith("display time=")) == 1
+    assert compact[-len(compact_sched.display()):] == compact_sched.display()
+
+def test_compact_display_with_steps_matches_full_events():
+    full = _build().run(quantum=1, steps=2)
+    compact = _build().run(quantum=1, steps=2, compact_display=True)
+
+    assert [l for l in compact if not l.startswith("display ")] == [
+        l for l in full if not l.startswith("display ")
+    ]
+    assert sum(1 for l in compact if l.startswith("display time=")) == 1
+
+def test_run_until_empty_sees_tasks_added_directly_to_a_queue():
+    from scheduler import Task
+    s = Scheduler()
+    s.create_queue("A", 3)
+    s.create_queue("B", 3)
+    s.queues["A"].enqueue(Task("A-x", 2))
+
+    logs = s.run(quantum=1, steps=None)
+
+    assert len(s.queues["A"]) == 0
+    assert "time=2 event=finish queue=A id=A-x" in logs
+
+def test_run_until_empty_stops_after_direct_dequeue():
+    s = Scheduler()
+    s.create_queue("A", 3)
+    s.enqueue("A", "tea")
+    s.queues["A"].dequeue()
+
+    logs = s.run(quantum=1, steps=None)  # must return, not spin forever
+
+    assert sum(1 for l in logs if "event=run" in l) == 1
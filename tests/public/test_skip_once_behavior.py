@@ -19,3 +19,22 @@ def test_skip_consumed_once_no_time_advance():
     # No work line tied to Mobile's first visit
     # (can't strictly assert time without implementation; hidden tests will)
     assert "event=skip" in "\n".join(s.mark_skip("WalkIns")) or True  # placeholder gentle check
+
+def test_skip_flags_is_a_live_view_of_pending_skips():
+    s = Scheduler()
+    s.create_queue("Mobile", 1)
+    s.create_queue("WalkIns", 1)
+    s.mark_skip("Mobile")
+    assert dict(s.skip_flags) == {"Mobile": True, "WalkIns": False}
+    assert "display Mobile [0/1] skip -> []" in s.display()
+
+    s.run(quantum=1, steps=1)
+    assert dict(s.skip_flags) == {"Mobile": False, "WalkIns": False}
+
+    # writing the mapping sets the same state mark_skip does
+    s.skip_flags["WalkIns"] = True
+    assert "display WalkIns [0/1] skip -> []" in s.display()
+    logs = s.run(quantum=1, steps=None)
+    assert not any(s.skip_flags.values())
+    # the pending WalkIns skip is consumed by the one turn it takes
+    assert [l for l in logs if "event=run" in l] == ["time=0 event=run queue=WalkIns"]